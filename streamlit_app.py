@@ -1,10 +1,28 @@
 import streamlit as st
+import hashlib
 import json
-from shapely.geometry import shape, Point
+import os
+import pickle
+import numpy as np
+import shapely
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+from shapely.geometry import shape, Point, box
+from shapely.prepared import prep
+from shapely.strtree import STRtree
 from geopy.geocoders import Nominatim
+from geopy.extra.rate_limiter import RateLimiter
 import pandas as pd
-from datetime import date
-import time
+from datetime import date, datetime
 
 # Configure page
 st.set_page_config(
@@ -13,14 +31,22 @@ st.set_page_config(
     layout="wide"
 )
 
+def _load_json_file(path):
+    '''Parse a JSON/GeoJSON file, using orjson when available (2-5x faster)'''
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 # Load mock addresses from JSON file
-@st.cache_data
+# cache_resource returns the dict by reference (no per-rerun deep copy);
+# callers must treat it as read-only
+@st.cache_resource
 def load_mock_addresses():
     '''Load mock addresses from JSON file'''
     try:
-        with open("mock_addresses_simple.json", "r", encoding="utf-8") as f:
-            addresses = json.load(f)
-            return addresses
+        return _load_json_file("mock_addresses_simple.json")
     except FileNotFoundError:
         st.warning("⚠️ mock_addresses_simple.json not found, using fallback addresses")
         # Fallback to a few default addresses
@@ -30,110 +56,409 @@ def load_mock_addresses():
         }
 
 # Load ALL GeoJSON files
-@st.cache_data
+# cache_resource returns the dicts by reference (no per-rerun deep copy);
+# callers must treat them as read-only
+@st.cache_resource
 def load_all_data():
     '''Load regions, branches, and technical zones'''
     data = {}
     
     # Load regions
     try:
-        with open("regions.geojson", "r", encoding="utf-8") as f:
-            data['regions'] = json.load(f)
+        data['regions'] = _load_json_file("regions.geojson")
     except FileNotFoundError:
         st.warning("⚠️ regions.geojson not found")
         data['regions'] = None
     
     # Load branches
     try:
-        with open("branches.geojson", "r", encoding="utf-8") as f:
-            data['branches'] = json.load(f)
+        data['branches'] = _load_json_file("branches.geojson")
     except FileNotFoundError:
         st.warning("⚠️ branches.geojson not found")
         data['branches'] = None
     
     # Load technical zones
     try:
-        with open("technical_zones.geojson", "r", encoding="utf-8") as f:
-            data['zones'] = json.load(f)
+        data['zones'] = _load_json_file("technical_zones.geojson")
     except FileNotFoundError:
         st.error("❌ technical_zones.geojson not found!")
         data['zones'] = None
     
     return data
 
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _pip_rings(xs, ys, ring_starts, ring_ends, first_ring, last_ring, px, py):
+        '''Even-odd (crossing number) point-in-polygon over flat ring arrays.
+
+        Counting crossings over the exterior and interior rings together
+        gives the correct parity for polygons with holes.
+        '''
+        crossings = 0
+        for r in range(first_ring, last_ring):
+            start = ring_starts[r]
+            end = ring_ends[r]
+            j = end - 1
+            for i in range(start, end):
+                xi, yi = xs[i], ys[i]
+                xj, yj = xs[j], ys[j]
+                if (yi > py) != (yj > py):
+                    if px < (xj - xi) * (py - yi) / (yj - yi) + xi:
+                        crossings += 1
+                j = i
+        return crossings & 1
+else:
+    _pip_rings = None
+
+def _extract_rings(geom):
+    '''Yield coordinate rings (exterior + holes) of a (Multi)Polygon'''
+    polys = geom.geoms if geom.geom_type == "MultiPolygon" else (geom,)
+    for poly in polys:
+        yield poly.exterior.coords
+        for interior in poly.interiors:
+            yield interior.coords
+
+def _build_ring_arrays(geoms):
+    '''Flatten polygon rings into CSR-style float64 arrays for the jitted PIP'''
+    xs_parts, ys_parts = [], []
+    ring_starts, ring_ends = [], []
+    poly_ring_starts, poly_ring_ends = [], []
+    offset = 0
+    n_rings = 0
+
+    for geom in geoms:
+        poly_ring_starts.append(n_rings)
+        for coords in _extract_rings(geom):
+            arr = np.asarray(coords, dtype=np.float64)
+            xs_parts.append(arr[:, 0])
+            ys_parts.append(arr[:, 1])
+            ring_starts.append(offset)
+            offset += len(arr)
+            ring_ends.append(offset)
+            n_rings += 1
+        poly_ring_ends.append(n_rings)
+
+    return {
+        "ring_xs": np.ascontiguousarray(np.concatenate(xs_parts)),
+        "ring_ys": np.ascontiguousarray(np.concatenate(ys_parts)),
+        "ring_starts": np.array(ring_starts, dtype=np.int64),
+        "ring_ends": np.array(ring_ends, dtype=np.int64),
+        "poly_ring_starts": np.array(poly_ring_starts, dtype=np.int64),
+        "poly_ring_ends": np.array(poly_ring_ends, dtype=np.int64),
+    }
+
+# Coarse raster grid: ~1 km cells (0.01 degree latitude)
+GRID_CELL_DEG = 0.01
+GRID_OUTSIDE = 0          # cell touches no feature
+GRID_AMBIGUOUS = 0xFFFF   # cell needs the exact PIP fallback
+
+def _build_coverage_grid(geoms, prepared):
+    '''Rasterize a layer onto a coarse uint16 grid.
+
+    Each cell stores feature_index + 1 when the cell lies fully inside
+    exactly one feature, GRID_OUTSIDE when it touches no feature, or
+    GRID_AMBIGUOUS for boundary/overlap cells. Lookups for most points
+    then reduce to a single array index.
+    '''
+    bounds = np.array([g.bounds for g in geoms])
+    minx, miny = bounds[:, 0].min(), bounds[:, 1].min()
+    maxx, maxy = bounds[:, 2].max(), bounds[:, 3].max()
+    n_cols = int(np.ceil((maxx - minx) / GRID_CELL_DEG))
+    n_rows = int(np.ceil((maxy - miny) / GRID_CELL_DEG))
+    grid = np.zeros((n_rows, n_cols), dtype=np.uint16)
+
+    for fi, geom in enumerate(geoms):
+        gminx, gminy, gmaxx, gmaxy = geom.bounds
+        c0 = max(int((gminx - minx) / GRID_CELL_DEG), 0)
+        c1 = min(int((gmaxx - minx) / GRID_CELL_DEG) + 1, n_cols)
+        r0 = max(int((gminy - miny) / GRID_CELL_DEG), 0)
+        r1 = min(int((gmaxy - miny) / GRID_CELL_DEG) + 1, n_rows)
+
+        for r in range(r0, r1):
+            cell_miny = miny + r * GRID_CELL_DEG
+            for c in range(c0, c1):
+                cell_minx = minx + c * GRID_CELL_DEG
+                cell = box(cell_minx, cell_miny,
+                           cell_minx + GRID_CELL_DEG, cell_miny + GRID_CELL_DEG)
+                if not prepared[fi].intersects(cell):
+                    continue
+                if grid[r, c] == GRID_OUTSIDE and prepared[fi].contains(cell):
+                    grid[r, c] = fi + 1
+                else:
+                    grid[r, c] = GRID_AMBIGUOUS
+
+    return {"grid": grid, "grid_origin": (minx, miny)}
+
+GEOJSON_FILES = ("regions.geojson", "branches.geojson", "technical_zones.geojson")
+INDEX_CACHE_DIR = "cache"
+# Bump whenever the pickled bundle layout changes (new/renamed keys),
+# so caches written by older code are ignored instead of loaded stale
+INDEX_SCHEMA_VERSION = 1
+
+def _index_cache_path():
+    '''Index cache file path, keyed by schema version + GeoJSON content hash'''
+    digest = hashlib.sha1()
+    digest.update(f"schema:{INDEX_SCHEMA_VERSION}".encode())
+    for path in GEOJSON_FILES:
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            digest.update(b"missing")
+    return os.path.join(INDEX_CACHE_DIR, f"indexes_{digest.hexdigest()}.pkl")
+
+def _interleave_bits(v):
+    '''Spread the low 16 bits of each value so they occupy even bit positions'''
+    v = v.astype(np.uint64)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x3333333333333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return v
+
+def _spatial_sort_order(centroids, bits=16):
+    '''Z-order (Morton) sort order for feature centroids.
+
+    Features sorted along a space-filling curve keep spatially close
+    polygons adjacent in every per-feature array, which gives a
+    better-balanced STRtree bulk load and cache-friendly scans.
+    '''
+    mins = centroids.min(axis=0)
+    spans = np.maximum(centroids.max(axis=0) - mins, 1e-12)
+    scale = (1 << bits) - 1
+    quantized = ((centroids - mins) / spans * scale).astype(np.uint64)
+    codes = _interleave_bits(quantized[:, 0]) | (_interleave_bits(quantized[:, 1]) << np.uint64(1))
+    return np.argsort(codes, kind="stable")
+
+# Build spatial indexes once per layer (STRtree + prepared geometries)
+@st.cache_resource
+def build_indexes(_all_data):
+    '''Build an STRtree and prepared geometries for each GeoJSON layer.
+
+    Geometries are constructed once here instead of on every lookup:
+    the STRtree gives a small candidate set per query and the prepared
+    geometries make the final contains() check cheap. The built bundle
+    is pickled to disk keyed by the GeoJSON content hash, so cold
+    starts with unchanged data skip reconstruction entirely.
+    '''
+    cache_path = _index_cache_path()
+    try:
+        with open(cache_path, "rb") as f:
+            indexes = pickle.load(f)
+        # Prepared geometries are not picklable - rebuild them (cheap)
+        for bundle in indexes.values():
+            if bundle:
+                bundle["prepared"] = [prep(g) for g in bundle["geoms"]]
+        return indexes
+    except Exception:
+        # Missing, truncated, or otherwise unreadable cache file:
+        # fall through and rebuild from the GeoJSON
+        pass
+
+    indexes = {}
+
+    for layer in ("regions", "branches", "zones"):
+        layer_data = _all_data.get(layer)
+        if not layer_data:
+            indexes[layer] = None
+            continue
+
+        geoms = []
+        for f in layer_data["features"]:
+            g = shape(f["geometry"])
+            if not g.is_valid:
+                # Repair once at load: invalid polygons (self-intersections
+                # etc.) make contains() pathologically slow or wrong
+                g = g.buffer(0)
+            geoms.append(g)
+        props = [f["properties"] for f in layer_data["features"]]
+        centroids = np.array(
+            [[g.centroid.x, g.centroid.y] for g in geoms], dtype=np.float64
+        )
+
+        # Reorder every per-feature array along a space-filling curve
+        # so spatially close features stay adjacent in memory
+        order = _spatial_sort_order(centroids)
+        geoms = [geoms[i] for i in order]
+        props = [props[i] for i in order]
+        centroids = centroids[order]
+
+        bboxes = np.array([g.bounds for g in geoms], dtype=np.float64)
+        prepared = [prep(g) for g in geoms]
+        indexes[layer] = {
+            "geoms": geoms,
+            "prepared": prepared,
+            "props": props,
+            "tree": STRtree(geoms),
+            # Contiguous AABB arrays for the vectorized bbox prefilter
+            "minx": np.ascontiguousarray(bboxes[:, 0]),
+            "miny": np.ascontiguousarray(bboxes[:, 1]),
+            "maxx": np.ascontiguousarray(bboxes[:, 2]),
+            "maxy": np.ascontiguousarray(bboxes[:, 3]),
+            # Centroid coordinates for the vectorized nearest-zone search
+            "centroids": centroids,
+            # Flat ring arrays for the Numba ray-casting PIP
+            **_build_ring_arrays(geoms),
+            # Coarse raster grid: most lookups resolve to one array index
+            **_build_coverage_grid(geoms, prepared),
+        }
+
+    # Persist everything picklable (STRtree pickles fine in Shapely >=2)
+    try:
+        os.makedirs(INDEX_CACHE_DIR, exist_ok=True)
+        payload = {
+            layer: (
+                {k: v for k, v in bundle.items() if k != "prepared"}
+                if bundle else None
+            )
+            for layer, bundle in indexes.items()
+        }
+        # Write via a temp file + atomic rename so a process killed
+        # mid-dump never leaves a partial file under the final name
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+    return indexes
+
+# Helper function: Find candidate features via the STRtree
+def _bbox_candidates(index, lng, lat):
+    '''Vectorized AABB reject: indices of features whose bbox contains the point'''
+    inside = (
+        (lng >= index["minx"]) & (lng <= index["maxx"]) &
+        (lat >= index["miny"]) & (lat <= index["maxy"])
+    )
+    return np.where(inside)[0]
+
+def _query_index(index, lng, lat):
+    '''Return the index of the first feature containing the point, or None'''
+    # Step 0: coarse grid lookup - unambiguous cells answer in O(1)
+    origin_x, origin_y = index["grid_origin"]
+    grid = index["grid"]
+    col = int((lng - origin_x) / GRID_CELL_DEG)
+    row = int((lat - origin_y) / GRID_CELL_DEG)
+    if 0 <= row < grid.shape[0] and 0 <= col < grid.shape[1]:
+        cell = int(grid[row, col])
+    else:
+        cell = GRID_OUTSIDE
+    if cell == GRID_OUTSIDE:
+        return None
+    if cell != GRID_AMBIGUOUS:
+        return cell - 1
+
+    # Ambiguous (boundary/overlap) cell: exact PIP fallback.
+    # Bbox prefilter in one NumPy expression, then exact test on the candidates.
+    # With Numba the exact test is a jitted ray-casting loop over flat ring
+    # arrays (no GEOS round-trip); otherwise prepared contains() is used.
+    # A Shapely Point is only built if the prepared fallback actually runs.
+    point = None
+    for i in _bbox_candidates(index, lng, lat):
+        i = int(i)
+        if NUMBA_AVAILABLE:
+            if _pip_rings(
+                index["ring_xs"], index["ring_ys"],
+                index["ring_starts"], index["ring_ends"],
+                index["poly_ring_starts"][i], index["poly_ring_ends"][i],
+                lng, lat
+            ):
+                return i
+        else:
+            if point is None:
+                point = Point(lng, lat)
+            if index["prepared"][i].contains(point):
+                return i
+    return None
+
 # Helper function: Find which region a point is in
-def find_region_for_point(lat, lng, regions_data):
+def find_region_for_point(lat, lng, index):
     '''Find which region contains the point'''
-    if not regions_data:
+    if not index:
         return None
-    
-    point = Point(lng, lat)
-    
-    for feature in regions_data["features"]:
-        polygon = shape(feature["geometry"])
-        if polygon.contains(point):
-            return {
-                "region_id": feature["properties"].get("region_id"),
-                "region_name": feature["properties"].get("region_name")
-            }
+
+    i = _query_index(index, lng, lat)
+    if i is not None:
+        props = index["props"][i]
+        return {
+            "region_id": props.get("region_id"),
+            "region_name": props.get("region_name")
+        }
     return None
 
 # Helper function: Find which branch a point is in
-def find_branch_for_point(lat, lng, branches_data):
+def find_branch_for_point(lat, lng, index):
     '''Find which branch contains the point'''
-    if not branches_data:
+    if not index:
         return None
-    
-    point = Point(lng, lat)
-    
-    for feature in branches_data["features"]:
-        polygon = shape(feature["geometry"])
-        if polygon.contains(point):
-            return {
-                "branch_id": feature["properties"].get("branch_id"),
-                "branch_name": feature["properties"].get("branch_name"),
-                "region_id": feature["properties"].get("region_id")
-            }
+
+    i = _query_index(index, lng, lat)
+    if i is not None:
+        props = index["props"][i]
+        return {
+            "branch_id": props.get("branch_id"),
+            "branch_name": props.get("branch_name"),
+            "region_id": props.get("region_id")
+        }
     return None
 
+# Great-circle distance helper
+def haversine_km(lat1, lng1, lat2, lng2):
+    '''Great-circle distance in kilometers (works on scalars or NumPy arrays)'''
+    lat1, lng1, lat2, lng2 = np.radians(lat1), np.radians(lng1), np.radians(lat2), np.radians(lng2)
+    dlat = lat2 - lat1
+    dlng = lng2 - lng1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 6371.0 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+# Batch zone lookup for arrays of coordinates (backfills, future API use)
+def find_zones_for_points(lats, lngs, index):
+    '''Find the containing zone for many points in one bulk tree query.
+
+    Returns a list with one entry per point: the matching feature's
+    properties dict, or None for points outside all zones.
+    '''
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+
+    # One vectorized GEOS call resolves all point/polygon pairs at once
+    points = shapely.points(lngs, lats)
+    point_idx, zone_idx = index["tree"].query(points, predicate="within")
+
+    results = [None] * len(points)
+    for p, z in zip(point_idx, zone_idx):
+        if results[int(p)] is None:
+            results[int(p)] = index["props"][int(z)]
+    return results
+
 # Zone detection function - HANDLES HUNGARIAN FIELD NAMES
-def find_zone_for_point(lat, lng, zones_data):
+def find_zone_for_point(lat, lng, index):
     '''Find which zone contains the point, or find nearest zone'''
-    point = Point(lng, lat)
-    
     # Step 1: Check if point is inside any zone
-    for feature in zones_data["features"]:
-        polygon = shape(feature["geometry"])
-        
-        if polygon.contains(point):
-            props = feature["properties"]
-            return {
-                "zone_id": props.get("bázis_id") or props.get("zone_id"),
-                "zone_name": props.get("bázis_név") or props.get("zone_name"),
-                "region_name": props.get("Régió"),
-                "created_by": props.get("created_by"),
-                "status": props.get("status"),
-                "method": "inside",
-                "confidence": "high"
-            }
-    
-    # Step 2: Find nearest zone (by centroid distance)
-    nearest_zone = None
-    min_distance = float("inf")
-    
-    for feature in zones_data["features"]:
-        polygon = shape(feature["geometry"])
-        centroid = polygon.centroid
-        distance = point.distance(centroid)
-        
-        if distance < min_distance:
-            min_distance = distance
-            nearest_zone = feature
-    
-    # Convert distance to kilometers
-    distance_km = min_distance * 85
-    
-    props = nearest_zone["properties"]
+    i = _query_index(index, lng, lat)
+    if i is not None:
+        props = index["props"][i]
+        return {
+            "zone_id": props.get("bázis_id") or props.get("zone_id"),
+            "zone_name": props.get("bázis_név") or props.get("zone_name"),
+            "region_name": props.get("Régió"),
+            "created_by": props.get("created_by"),
+            "status": props.get("status"),
+            "method": "inside",
+            "confidence": "high"
+        }
+
+    # Step 2: Find nearest zone (by centroid distance, vectorized)
+    # Euclidean degrees are fine for ranking; true km only for the winner
+    diffs = index["centroids"] - np.array([lng, lat])
+    d2 = np.einsum('ij,ij->i', diffs, diffs)
+    nearest = int(np.argmin(d2))
+
+    cx, cy = index["centroids"][nearest]
+    distance_km = float(haversine_km(lat, lng, cy, cx))
+
+    props = index["props"][nearest]
     return {
         "zone_id": props.get("bázis_id") or props.get("zone_id"),
         "zone_name": props.get("bázis_név") or props.get("zone_name"),
@@ -145,6 +470,74 @@ def find_zone_for_point(lat, lng, zones_data):
         "distance_km": round(distance_km, 2)
     }
 
+# Nominatim client - module-level so the underlying session is reused,
+# rate-limited per the Nominatim usage policy (max 1 request/second)
+_geolocator = Nominatim(user_agent="hungary_zone_lookup_poc")
+_rate_limited_geocode = RateLimiter(_geolocator.geocode, min_delay_seconds=1)
+
+# On-disk geocode cache so results survive app restarts
+GEOCODE_CACHE_FILE = "geocode_cache.json"
+
+def _read_geocode_cache():
+    '''Read the on-disk geocode cache (empty dict if missing or unreadable)'''
+    try:
+        with open(GEOCODE_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_geocode_cache(cache):
+    '''Write the on-disk geocode cache (best effort)'''
+    try:
+        with open(GEOCODE_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except OSError:
+        pass
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _geocode_uncached(address):
+    '''Geocode a normalized address via Nominatim (cached for a day).
+
+    Network errors propagate as exceptions, which st.cache_data does
+    not memoize - only successful and genuine not-found results are
+    cached, so a transient timeout never pins an address to a failure.
+    '''
+    # Check the on-disk cache first - Nominatim policy requires caching
+    disk_cache = _read_geocode_cache()
+    if address in disk_cache:
+        return disk_cache[address]
+
+    location = _rate_limited_geocode(f"{address}, Hungary", timeout=10)
+
+    if location:
+        result = {
+            "lat": location.latitude,
+            "lng": location.longitude,
+            "formatted_address": location.address,
+            "success": True,
+            "method": "exact"
+        }
+    else:
+        # Fallback: city only
+        city = address.split(",")[0].strip()
+        location = _rate_limited_geocode(f"{city}, Hungary", timeout=10)
+
+        if location:
+            result = {
+                "lat": location.latitude,
+                "lng": location.longitude,
+                "formatted_address": location.address,
+                "success": True,
+                "method": "city_only",
+                "note": f"Street not found, using {city} city center"
+            }
+        else:
+            return {"success": False, "error": "Address not found"}
+
+    disk_cache[address] = result
+    _write_geocode_cache(disk_cache)
+    return result
+
 # Geocoding function
 def geocode_address(address, mock_addresses):
     '''Convert address to coordinates using mock data or real geocoding'''
@@ -158,47 +551,127 @@ def geocode_address(address, mock_addresses):
             "success": True,
             "method": "mock"
         }
-    
-    # Try real geocoding
+
+    # Real geocoding - normalize so repeat lookups hit the cache
     try:
-        geolocator = Nominatim(user_agent="hungary_zone_lookup_poc")
-        location = geolocator.geocode(f"{address}, Hungary", timeout=10)
-        
-        if location:
-            return {
-                "lat": location.latitude,
-                "lng": location.longitude,
-                "formatted_address": location.address,
-                "success": True,
-                "method": "exact"
-            }
-        
-        # Fallback: city only
-        city = address.split(",")[0].strip()
-        location = geolocator.geocode(f"{city}, Hungary", timeout=10)
-        
-        if location:
-            return {
-                "lat": location.latitude,
-                "lng": location.longitude,
-                "formatted_address": location.address,
-                "success": True,
-                "method": "city_only",
-                "note": f"Street not found, using {city} city center"
-            }
-        
-        return {"success": False, "error": "Address not found"}
-    
+        return _geocode_uncached(address.strip().lower())
     except Exception as e:
         return {"success": False, "error": f"Geocoding error: {str(e)}"}
 
+# Submission record columns, in display/export order
+SUBMISSION_COLS = (
+    "timestamp", "name", "address", "formatted_address",
+    "latitude", "longitude",
+    "region_id", "region_name", "branch_id", "branch_name",
+    "zone_id", "zone_name", "status", "created_by",
+    "detection_method", "confidence", "distance_km",
+    "product", "reason", "date"
+)
+
+def _empty_submissions():
+    '''Fresh column-oriented submissions store (append-only dict of lists)'''
+    return {col: [] for col in SUBMISSION_COLS}
+
+def _submission_count():
+    '''Number of stored submissions'''
+    return len(st.session_state.submissions["timestamp"])
+
+@st.cache_data(show_spinner=False)
+def _submissions_csv(n_rows, last_timestamp):
+    '''Serialize the submissions table to CSV bytes plus a download filename.
+
+    Keyed on (row count, last timestamp) so the serialization only
+    reruns when a submission is added or cleared, not on every rerun
+    the download button happens to render in. The filename is cached
+    alongside the bytes so it stops churning on unchanged data.
+    '''
+    filename = f"zone_submissions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    return st.session_state.submissions_df.to_csv(index=False).encode("utf-8"), filename
+
 # Initialize session state
 if "submissions" not in st.session_state:
-    st.session_state.submissions = []
+    st.session_state.submissions = _empty_submissions()
+if "submissions_df" not in st.session_state:
+    # Maintained incrementally on submit so reruns never rebuild it
+    st.session_state.submissions_df = pd.DataFrame(columns=list(SUBMISSION_COLS))
 
 # Load data
 mock_addresses = load_mock_addresses()
 all_data = load_all_data()
+indexes = build_indexes(all_data)
+
+# Submit callback - runs before the rerun, so the script body never
+# re-executes the heavy path; results are handed over via session state
+def _handle_submit():
+    '''Geocode the submitted address, resolve the zone hierarchy, store the record'''
+    name = st.session_state.get("form_name", "")
+    if st.session_state.get("form_address_mode") == "Use demo address":
+        address = st.session_state.get("form_address_demo", "")
+    else:
+        address = st.session_state.get("form_address_custom", "")
+
+    if not name or not address:
+        st.session_state.last_result = {"error": "Please fill in Name and Address!"}
+        return
+
+    # Cached singletons - instant on every call after the first
+    mock = load_mock_addresses()
+    idx = build_indexes(load_all_data())
+
+    geo_result = geocode_address(address, mock)
+    if not geo_result["success"]:
+        st.session_state.last_result = {"error": geo_result.get("error")}
+        return
+
+    # Find location hierarchy
+    region_result = find_region_for_point(
+        geo_result["lat"], geo_result["lng"], idx['regions']
+    )
+    branch_result = find_branch_for_point(
+        geo_result["lat"], geo_result["lng"], idx['branches']
+    )
+    zone_result = find_zone_for_point(
+        geo_result["lat"], geo_result["lng"], idx['zones']
+    )
+
+    # Create submission (one timestamp per submission, plain datetime)
+    now = datetime.now()
+    submission = {
+        "timestamp": now.isoformat(),
+        "name": name,
+        "address": address,
+        "formatted_address": geo_result["formatted_address"],
+        "latitude": round(geo_result["lat"], 6),
+        "longitude": round(geo_result["lng"], 6),
+        "region_id": region_result["region_id"] if region_result else "N/A",
+        "region_name": region_result["region_name"] if region_result else (zone_result.get("region_name") or "N/A"),
+        "branch_id": branch_result["branch_id"] if branch_result else "N/A",
+        "branch_name": branch_result["branch_name"] if branch_result else "N/A",
+        "zone_id": zone_result["zone_id"],
+        "zone_name": zone_result["zone_name"],
+        "status": zone_result.get("status", "N/A"),
+        "created_by": zone_result.get("created_by", "N/A"),
+        "detection_method": zone_result["method"],
+        "confidence": zone_result["confidence"],
+        "distance_km": zone_result.get("distance_km", 0),
+        "product": st.session_state.get("form_product") or "N/A",
+        "reason": st.session_state.get("form_reason") or "N/A",
+        "date": str(st.session_state.get("form_date", date.today()))
+    }
+
+    for col in SUBMISSION_COLS:
+        st.session_state.submissions[col].append(submission[col])
+    st.session_state.submissions_df = pd.concat(
+        [st.session_state.submissions_df, pd.DataFrame([submission])],
+        ignore_index=True
+    )
+
+    st.session_state.last_result = {
+        "geo_result": geo_result,
+        "region_result": region_result,
+        "branch_result": branch_result,
+        "zone_result": zone_result,
+    }
 
 # Main UI
 st.title("🗺️ Hungary Zone Lookup System")
@@ -215,182 +688,162 @@ with col1:
     st.header("📝 Submission Form")
     
     with st.form("submission_form", clear_on_submit=True):
-        name = st.text_input("Name *", placeholder="Enter your name")
-        
+        st.text_input("Name *", placeholder="Enter your name", key="form_name")
+
         st.subheader("Address")
-        
+
         # Show info about available addresses
         st.info(f"ℹ️ {len(mock_addresses)} demo addresses available covering all zones")
-        
+
         address_mode = st.radio(
             "Choose input method:",
             ["Use demo address", "Enter custom address"],
-            horizontal=True
+            horizontal=True,
+            key="form_address_mode"
         )
-        
+
         if address_mode == "Use demo address":
             # Create searchable selectbox with all mock addresses
-            address = st.selectbox(
+            st.selectbox(
                 "Select or search demo address:",
                 options=sorted(mock_addresses.keys()),
-                help="Type to search addresses"
+                help="Type to search addresses",
+                key="form_address_demo"
             )
         else:
-            address = st.text_input(
+            st.text_input(
                 "Enter address:",
-                placeholder="e.g., Budapest, Andrássy út 1"
+                placeholder="e.g., Budapest, Andrássy út 1",
+                key="form_address_custom"
             )
-        
-        product = st.text_input("Product", placeholder="Product name (optional)")
-        reason = st.text_area("Reason", placeholder="Reason for submission (optional)")
-        submission_date = st.date_input("Date", value=date.today())
-        
+
+        st.text_input("Product", placeholder="Product name (optional)", key="form_product")
+        st.text_area("Reason", placeholder="Reason for submission (optional)", key="form_reason")
+        st.date_input("Date", value=date.today(), key="form_date")
+
         col_btn1, col_btn2, col_btn3 = st.columns([1, 1, 1])
         with col_btn2:
-            submitted = st.form_submit_button(
+            # Heavy work happens in the callback; the script body only renders
+            st.form_submit_button(
                 "🔍 Find Zone & Submit",
                 use_container_width=True,
-                type="primary"
+                type="primary",
+                on_click=_handle_submit
             )
-    
-    if submitted:
-        if not name or not address:
-            st.error("❌ Please fill in Name and Address!")
+
+    # Render the outcome of the last submit (set by the callback)
+    result = st.session_state.pop("last_result", None)
+    if result:
+        if "error" in result:
+            st.error(f"❌ {result['error']}")
         else:
-            with st.spinner("🔍 Processing..."):
-                geo_result = geocode_address(address, mock_addresses)
-            
-            if not geo_result["success"]:
-                st.error(f"❌ {geo_result.get('error')}")
-            else:
-                # Find location hierarchy
-                region_result = find_region_for_point(
-                    geo_result["lat"], geo_result["lng"], all_data['regions']
-                )
-                branch_result = find_branch_for_point(
-                    geo_result["lat"], geo_result["lng"], all_data['branches']
-                )
-                
-                with st.spinner("📍 Detecting zone..."):
-                    zone_result = find_zone_for_point(
-                        geo_result["lat"], geo_result["lng"], all_data['zones']
-                    )
-                
-                # Create submission
-                submission = {
-                    "timestamp": pd.Timestamp.now(),
-                    "name": name,
-                    "address": address,
-                    "formatted_address": geo_result["formatted_address"],
-                    "latitude": round(geo_result["lat"], 6),
-                    "longitude": round(geo_result["lng"], 6),
-                    "region_id": region_result["region_id"] if region_result else "N/A",
-                    "region_name": region_result["region_name"] if region_result else (zone_result.get("region_name") or "N/A"),
-                    "branch_id": branch_result["branch_id"] if branch_result else "N/A",
-                    "branch_name": branch_result["branch_name"] if branch_result else "N/A",
-                    "zone_id": zone_result["zone_id"],
-                    "zone_name": zone_result["zone_name"],
-                    "status": zone_result.get("status", "N/A"),
-                    "created_by": zone_result.get("created_by", "N/A"),
-                    "detection_method": zone_result["method"],
-                    "confidence": zone_result["confidence"],
-                    "distance_km": zone_result.get("distance_km", 0),
-                    "product": product or "N/A",
-                    "reason": reason or "N/A",
-                    "date": str(submission_date)
-                }
-                
-                st.session_state.submissions.append(submission)
-                st.success("✅ Submission saved successfully!")
-                
-                # Display results
-                st.markdown("---")
-                st.subheader("📊 Location Detection Results")
-                
-                result_col1, result_col2, result_col3 = st.columns(3)
-                
-                with result_col1:
-                    st.markdown("**🌍 Region**")
-                    if region_result:
-                        st.metric("Region ID", region_result["region_id"])
-                        st.metric("Region Name", region_result["region_name"])
-                    else:
-                        st.metric("Region Name", zone_result.get("region_name", "N/A"))
-                
-                with result_col2:
-                    st.markdown("**🏢 Branch**")
-                    if branch_result:
-                        st.metric("Branch ID", branch_result["branch_id"])
-                        st.metric("Branch Name", branch_result["branch_name"])
-                    else:
-                        st.info("Not detected")
-                
-                with result_col3:
-                    st.markdown("**📍 Technical Zone (Base)**")
-                    st.metric("Zone ID", zone_result["zone_id"])
-                    st.metric("Zone Name", zone_result["zone_name"])
-                    st.caption(f"Status: {zone_result.get('status', 'N/A')}")
-                
-                st.markdown("---")
-                if zone_result["method"] == "inside":
-                    st.info("✅ Address is INSIDE this zone (High confidence)")
+            geo_result = result["geo_result"]
+            region_result = result["region_result"]
+            branch_result = result["branch_result"]
+            zone_result = result["zone_result"]
+
+            st.success("✅ Submission saved successfully!")
+
+            # Display results
+            st.markdown("---")
+            st.subheader("📊 Location Detection Results")
+
+            result_col1, result_col2, result_col3 = st.columns(3)
+
+            with result_col1:
+                st.markdown("**🌍 Region**")
+                if region_result:
+                    st.metric("Region ID", region_result["region_id"])
+                    st.metric("Region Name", region_result["region_name"])
                 else:
-                    st.warning(f"⚠️ Address is OUTSIDE all zones\n\nNearest zone: **{zone_result['zone_name']}**\n\nDistance: **{zone_result['distance_km']} km**")
-                
-                if "note" in geo_result:
-                    st.info(f"ℹ️ {geo_result['note']}")
+                    st.metric("Region Name", zone_result.get("region_name", "N/A"))
+
+            with result_col2:
+                st.markdown("**🏢 Branch**")
+                if branch_result:
+                    st.metric("Branch ID", branch_result["branch_id"])
+                    st.metric("Branch Name", branch_result["branch_name"])
+                else:
+                    st.info("Not detected")
+
+            with result_col3:
+                st.markdown("**📍 Technical Zone (Base)**")
+                st.metric("Zone ID", zone_result["zone_id"])
+                st.metric("Zone Name", zone_result["zone_name"])
+                st.caption(f"Status: {zone_result.get('status', 'N/A')}")
+
+            st.markdown("---")
+            if zone_result["method"] == "inside":
+                st.info("✅ Address is INSIDE this zone (High confidence)")
+            else:
+                st.warning(f"⚠️ Address is OUTSIDE all zones\n\nNearest zone: **{zone_result['zone_name']}**\n\nDistance: **{zone_result['distance_km']} km**")
+
+            if "note" in geo_result:
+                st.info(f"ℹ️ {geo_result['note']}")
 
 with col2:
     st.header("📊 Statistics")
     
-    if st.session_state.submissions:
-        total = len(st.session_state.submissions)
-        inside = sum(1 for s in st.session_state.submissions if s["detection_method"] == "inside")
-        
+    total = _submission_count()
+    if total:
+        inside = int(np.sum(
+            np.asarray(st.session_state.submissions["detection_method"]) == "inside"
+        ))
+
         st.metric("Total Submissions", total)
         st.metric("Inside Zones", inside, delta=f"{(inside/total*100):.0f}%")
         st.metric("Outside Zones", total - inside)
-        
-        if total > 0:
-            st.markdown("---")
-            st.subheader("Region Distribution")
-            region_counts = {}
-            for s in st.session_state.submissions:
-                region = s.get("region_name", "Unknown")
-                region_counts[region] = region_counts.get(region, 0) + 1
-            
-            for region, count in sorted(region_counts.items(), key=lambda x: x[1], reverse=True):
-                st.text(f"{region}: {count}")
+
+        st.markdown("---")
+        st.subheader("Region Distribution")
+        region_counts = pd.Series(
+            st.session_state.submissions["region_name"]
+        ).value_counts()
+
+        for region, count in region_counts.items():
+            st.text(f"{region}: {count}")
     else:
         st.info("No submissions yet\n\nFill the form to get started!")
 
-# Submissions table
-if st.session_state.submissions:
+# Submissions table - a fragment, so unrelated widget interactions
+# (typing in the form fields, etc.) don't re-execute this block
+@st.fragment
+def render_submissions():
+    '''Render the submissions table and export controls'''
+    if not _submission_count():
+        return
+
     st.markdown("---")
     st.header("📋 All Submissions")
-    
-    df = pd.DataFrame(st.session_state.submissions)
-    
+
+    # Maintained incrementally on submit - no per-rerun reconstruction
+    df = st.session_state.submissions_df
+
     display_cols = ["name", "address", "region_name", "branch_name", "zone_name", "status", "detection_method", "date"]
-    
+
     st.dataframe(df[display_cols], use_container_width=True, hide_index=True)
-    
+
     col_export1, col_export2 = st.columns(2)
-    
+
     with col_export1:
-        csv = df.to_csv(index=False)
+        csv, csv_filename = _submissions_csv(
+            _submission_count(), st.session_state.submissions["timestamp"][-1]
+        )
         st.download_button(
             label="📥 Download as CSV",
             data=csv,
-            file_name=f"zone_submissions_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            file_name=csv_filename,
             mime="text/csv",
             use_container_width=True
         )
-    
+
     with col_export2:
         if st.button("🗑️ Clear All Submissions", use_container_width=True):
-            st.session_state.submissions = []
+            st.session_state.submissions = _empty_submissions()
+            st.session_state.submissions_df = pd.DataFrame(columns=list(SUBMISSION_COLS))
             st.rerun()
 
+render_submissions()
+
 st.markdown("---")
 st.caption("🗺️ Hungary Zone Lookup System | PoC | Region → Branch → Technical Zone (Base)")